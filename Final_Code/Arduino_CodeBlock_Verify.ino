@@ -255,9 +255,9 @@ void handleArc(const String &line, bool clockwise) {
 
   // Verify every waypoint is reachable
   int errors = 0;
+  float dAngle = sweep / nSteps;   // one divide, hoisted out of the loop
   for (int i = 1; i <= nSteps; i++) {
-    float t     = (float)i / nSteps;
-    float angle = startAngle + t * sweep;
+    float angle = startAngle + i * dAngle;
     float wx    = cx + radius * cos(angle);
     float wy    = cy + radius * sin(angle);
     float a1, a2;
@@ -295,9 +295,9 @@ void handleArc(const String &line, bool clockwise) {
   Serial.print(nSteps); Serial.print(" steps, radius ");
   Serial.print(radius, 2); Serial.println("\"");
 
+  float dAngle = sweep / nSteps;   // one divide, hoisted out of the loop
   for (int i = 1; i <= nSteps; i++) {
-    float t     = (float)i / nSteps;
-    float angle = startAngle + t * sweep;
+    float angle = startAngle + i * dAngle;
     float wx    = cx + radius * cos(angle);
     float wy    = cy + radius * sin(angle);
     
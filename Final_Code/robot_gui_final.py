@@ -22,6 +22,9 @@ Supported commands written to moves.txt:
 import tkinter as tk
 from tkinter import scrolledtext, filedialog, messagebox, ttk
 import math
+from array import array
+from functools import lru_cache
+from itertools import islice
 
 # ============================================================================
 # CONFIGURATION  —  edit to match your robot
@@ -38,17 +41,42 @@ CANVAS_WIDTH  = int(PAPER_WIDTH_INCHES  * PIXELS_PER_INCH)   # 425 px
 CANVAS_HEIGHT = int(PAPER_HEIGHT_INCHES * PIXELS_PER_INCH)   # 550 px
 
 DEFAULT_FEED_RATE = 2.0   # inches/sec used when exporting canvas drawing
+SIMPLIFY_EPS      = 0.01  # inches; export drops points this close to the path
 BRUSH_SIZE        = 3
 DRAW_COLOR        = "black"
+MIN_STEP_PX       = 2     # drag samples nearer than this to the last are skipped
+READOUT_MS        = 16    # ms between position readouts while drawing
 WINDOW_TITLE      = "SCARA Robot Controller"
 
 # ============================================================================
 # HELPERS
 # ============================================================================
 
+_INV_PPI     = 1.0 / PIXELS_PER_INCH   # folded once; helpers multiply per point
+_DEG_PER_RAD = 180.0 / math.pi
+
+# Arm geometry terms used by inverse_kinematics, computed once
+_R_MAX     = ARM_L1 + ARM_L2
+_R_MIN     = abs(ARM_L1 - ARM_L2)
+_R_MAX_SQ  = _R_MAX * _R_MAX
+_R_MIN_SQ  = _R_MIN * _R_MIN
+_L_SQ_SUM  = ARM_L1 * ARM_L1 + ARM_L2 * ARM_L2
+_TWO_L1_L2 = 2 * ARM_L1 * ARM_L2
+
+# Workspace guide on the canvas: reach circle and centre dot bounding boxes
+_WS_CX, _WS_CY = CANVAS_WIDTH // 2, CANVAS_HEIGHT // 2
+_WS_R_PX       = _R_MAX * PIXELS_PER_INCH
+_WS_REACH_BBOX = (_WS_CX - _WS_R_PX, _WS_CY - _WS_R_PX,
+                  _WS_CX + _WS_R_PX, _WS_CY + _WS_R_PX)
+_WS_DOT_BBOX   = (_WS_CX - 3, _WS_CY - 3, _WS_CX + 3, _WS_CY + 3)
+
+# Canvas-export move line; the feed rate is fixed, so it is baked in once
+_G1_FMT = "G1 X%.3f Y%.3f F" + str(DEFAULT_FEED_RATE) + "\n"
+
+
 def canvas_to_robot(cx, cy):
     """Canvas pixels  →  robot workspace inches (flips Y axis)."""
-    return cx / PIXELS_PER_INCH, (CANVAS_HEIGHT - cy) / PIXELS_PER_INCH
+    return cx * _INV_PPI, (CANVAS_HEIGHT - cy) * _INV_PPI
 
 
 def inverse_kinematics(x, y):
@@ -56,19 +84,74 @@ def inverse_kinematics(x, y):
     Return (theta1_deg, theta2_deg) for Cartesian target (x, y) in inches.
     Raises ValueError when position is out of reach.
     """
-    r = math.sqrt(x ** 2 + y ** 2)
-    if r > (ARM_L1 + ARM_L2):
-        raise ValueError(f"Too far: {r:.2f}\" > {ARM_L1+ARM_L2}\"")
-    if r < abs(ARM_L1 - ARM_L2):
-        raise ValueError(f"Too close: {r:.2f}\" < {abs(ARM_L1-ARM_L2)}\"")
+    r2 = x * x + y * y
+    if r2 > _R_MAX_SQ:   # radius only needed for the error message
+        raise ValueError(f"Too far: {math.hypot(x, y):.2f}\" > {_R_MAX}\"")
+    if r2 < _R_MIN_SQ:
+        raise ValueError(f"Too close: {math.hypot(x, y):.2f}\" < {_R_MIN}\"")
 
-    cos_t2 = (x**2 + y**2 - ARM_L1**2 - ARM_L2**2) / (2 * ARM_L1 * ARM_L2)
+    cos_t2 = (r2 - _L_SQ_SUM) / _TWO_L1_L2
     cos_t2 = max(-1.0, min(1.0, cos_t2))
     t2     = math.acos(cos_t2)
     k1     = ARM_L1 + ARM_L2 * math.cos(t2)
     k2     = ARM_L2 * math.sin(t2)
     t1     = math.atan2(y, x) - math.atan2(k2, k1)
-    return math.degrees(t1), math.degrees(t2)
+    return t1 * _DEG_PER_RAD, t2 * _DEG_PER_RAD
+
+
+def simplify_path(path, eps=SIMPLIFY_EPS):
+    """
+    Ramer-Douglas-Peucker on a flat [x0, y0, x1, y1, ...] path in inches.
+    Keeps the points that lie more than eps from the simplified segments.
+    Iterative (explicit stack), so long drawings can't hit recursion limits.
+    """
+    n = len(path) // 2
+    if n < 3:
+        return array("d", path)
+    keep = bytearray(n)
+    keep[0] = keep[n - 1] = 1
+    eps_sq = eps * eps
+    stack = [(0, n - 1)]
+    while stack:
+        i0, i1 = stack.pop()
+        ax, ay = path[2 * i0], path[2 * i0 + 1]
+        dx, dy = path[2 * i1] - ax, path[2 * i1 + 1] - ay
+        seg_sq = dx * dx + dy * dy
+        far_sq, far_i = eps_sq, -1   # squared distances: no sqrt per point
+        for i in range(i0 + 1, i1):
+            px, py = path[2 * i] - ax, path[2 * i + 1] - ay
+            t = (px * dx + py * dy) / seg_sq if seg_sq else 0.0
+            if t <= 0.0:     # before the chord (or closed loop): to start
+                d_sq = px * px + py * py
+            elif t >= 1.0:   # past the chord, e.g. a back-tracked stroke
+                ex, ey = px - dx, py - dy
+                d_sq = ex * ex + ey * ey
+            else:
+                cross = px * dy - py * dx
+                d_sq = cross * cross / seg_sq
+            if d_sq > far_sq:
+                far_sq, far_i = d_sq, i
+        if far_i >= 0:
+            keep[far_i] = 1
+            stack.append((i0, far_i))
+            stack.append((far_i, i1))
+    out = array("d")
+    for i in range(n):
+        if keep[i]:
+            out.extend((path[2 * i], path[2 * i + 1]))
+    return out
+
+
+@lru_cache(maxsize=4096)
+def _ik_cached(qx, qy):
+    """
+    inverse_kinematics on a 0.01" grid (qx, qy in hundredths of an inch).
+    Returns None when out of reach, so misses never raise.
+    """
+    x, y = qx * 0.01, qy * 0.01
+    if _R_MIN_SQ <= x * x + y * y <= _R_MAX_SQ:
+        return inverse_kinematics(x, y)
+    return None
 
 # ============================================================================
 # SAMPLE G-CODE  (shows every supported command)
@@ -100,6 +183,14 @@ M2           ; End program
 # GUI
 # ============================================================================
 
+class _TextPeer(tk.Text):
+    """Text widget sharing another Text's buffer (Tk 8.5+ text peer)."""
+
+    def __init__(self, master, source, **kw):
+        tk.BaseWidget._setup(self, master, {})
+        source.peer_create(self._w, **kw)
+
+
 class RobotControllerGUI:
 
     def __init__(self, root):
@@ -110,7 +201,15 @@ class RobotControllerGUI:
         self.drawing_enabled = False
         self.last_x = None
         self.last_y = None
-        self.drawing_path = []   # list of (robot_x, robot_y)
+        self.drawing_path = array("d")   # flat robot inches: x0, y0, x1, y1, ...
+        self._stroke_id  = None  # canvas polyline for the current stroke
+        self._stroke_pts = []    # its flat [x0, y0, x1, y1, ...] coords
+        self._pending_motion = None  # latest (rx, ry) awaiting a readout
+        self._motion_job = None      # after() id of the scheduled readout
+        # Log lines waiting for the next batched flush, per log widget
+        self._log_pending = {"canvas_log": [], "gcode_log": []}
+        self._log_flush_job = None
+        self._gcode_cache = None  # editor text; None after an edit
 
         self._build_ui()
 
@@ -149,9 +248,11 @@ class RobotControllerGUI:
         self.nb.add(self.tab_canvas, text="  Canvas Drawing  ")
         self._build_canvas_tab()
 
+        # G-code widgets are built on first visit to keep startup light
         self.tab_gcode = tk.Frame(self.nb)
         self.nb.add(self.tab_gcode, text="  G-code Commands  ")
-        self._build_gcode_tab()
+        self._gcode_built = False
+        self.nb.bind("<<NotebookTabChanged>>", self._on_tab_changed)
 
         # Status bar
         bar = tk.Frame(self.root, relief=tk.SUNKEN, borderwidth=2, bg="#ecf0f1")
@@ -205,7 +306,7 @@ class RobotControllerGUI:
                                 width=CANVAS_WIDTH, height=CANVAS_HEIGHT,
                                 cursor="crosshair")
         self.canvas.pack()
-        self._draw_workspace()
+        self.root.after_idle(self._draw_workspace)   # after the first paint
 
         self.canvas.bind("<Button-1>",        self._start_draw)
         self.canvas.bind("<B1-Motion>",       self._on_draw)
@@ -243,7 +344,7 @@ class RobotControllerGUI:
                                                     font=("Courier", 10))
         self.gcode_text.pack(fill=tk.BOTH, expand=True, pady=5)
         self.gcode_text.insert(1.0, SAMPLE_GCODE)
-        self.gcode_text.bind("<<Modified>>", self._sync_preview)
+        self.gcode_text.bind("<<Modified>>", self._on_gcode_modified)
 
         btns = tk.Frame(left)
         btns.pack(pady=8)
@@ -267,11 +368,16 @@ class RobotControllerGUI:
                  text="moves.txt Preview  (what Arduino will receive):",
                  font=("Arial", 10, "bold")).pack(anchor=tk.W)
 
-        self.preview = scrolledtext.ScrolledText(right, height=20,
-                                                 font=("Courier", 9),
-                                                 state=tk.DISABLED,
-                                                 bg="#f8f8f8")
-        self.preview.pack(fill=tk.BOTH, expand=True, pady=5)
+        # Peer of the editor: shows the same buffer live, nothing is copied
+        pv = tk.Frame(right)
+        pv.pack(fill=tk.BOTH, expand=True, pady=5)
+        self.preview = _TextPeer(pv, self.gcode_text, height=20,
+                                 font=("Courier", 9), state=tk.DISABLED,
+                                 bg="#f8f8f8")
+        sb = tk.Scrollbar(pv, command=self.preview.yview)
+        self.preview.config(yscrollcommand=sb.set)
+        sb.pack(side=tk.RIGHT, fill=tk.Y)
+        self.preview.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
 
         # Command reference
         ref = (
@@ -293,6 +399,12 @@ class RobotControllerGUI:
     # MODE SWITCH
     # ------------------------------------------------------------------
 
+    def _on_tab_changed(self, _event=None):
+        if not self._gcode_built and self.nb.select() == str(self.tab_gcode):
+            self._gcode_built = True
+            self._build_gcode_tab()
+            self._flush_logs()   # messages logged before the tab existed
+
     def _switch_mode(self):
         if self.mode_var.get() == "canvas":
             self.nb.select(self.tab_canvas)
@@ -306,19 +418,15 @@ class RobotControllerGUI:
     # ------------------------------------------------------------------
 
     def _draw_workspace(self):
-        cx, cy = CANVAS_WIDTH // 2, CANVAS_HEIGHT // 2
-        r_px   = (ARM_L1 + ARM_L2) * PIXELS_PER_INCH
-        self.canvas.create_oval(cx - r_px, cy - r_px,
-                                cx + r_px, cy + r_px,
-                                outline="#2ecc71", width=2, dash=(5, 5))
-        self.canvas.create_oval(cx - 3, cy - 3, cx + 3, cy + 3,
-                                fill="#3498db", outline="")
+        self.canvas.create_oval(*_WS_REACH_BBOX, outline="#2ecc71",
+                                width=2, dash=(5, 5))
+        self.canvas.create_oval(*_WS_DOT_BBOX, fill="#3498db", outline="")
 
     def _toggle_draw(self):
         self.drawing_enabled = not self.drawing_enabled
         if self.drawing_enabled:
             self.draw_btn.config(text="Disable Drawing", bg="#e74c3c")
-            self.drawing_path = []
+            self.drawing_path = array("d")
             self.log_canvas("Drawing enabled — drag mouse to draw")
         else:
             self.draw_btn.config(text="Enable Drawing", bg="#2ecc71")
@@ -327,34 +435,54 @@ class RobotControllerGUI:
     def _start_draw(self, event):
         if self.drawing_enabled:
             self.last_x, self.last_y = event.x, event.y
+            self._stroke_pts = [event.x, event.y]
+            self._stroke_id = None
 
     def _on_draw(self, event):
         if not self.drawing_enabled or self.last_x is None:
             return
-        self.canvas.create_line(self.last_x, self.last_y,
-                                event.x, event.y,
-                                width=BRUSH_SIZE, fill=DRAW_COLOR,
-                                capstyle=tk.ROUND, smooth=True)
+        # Repeats and sub-2px jitter add points but no visible detail
+        if abs(event.x - self.last_x) + abs(event.y - self.last_y) < MIN_STEP_PX:
+            return
+        # One polyline item per stroke: extend its coords, don't add items
+        self._stroke_pts += (event.x, event.y)
+        if self._stroke_id is None:
+            self._stroke_id = self.canvas.create_line(
+                *self._stroke_pts, width=BRUSH_SIZE, fill=DRAW_COLOR,
+                capstyle=tk.ROUND, joinstyle=tk.ROUND, smooth=True,
+                tags="stroke")
+        else:
+            self.canvas.coords(self._stroke_id, *self._stroke_pts)
         rx, ry = canvas_to_robot(event.x, event.y)
-        self.drawing_path.append((rx, ry))
-        try:
-            t1, t2 = inverse_kinematics(rx, ry)
+        self.drawing_path.extend((rx, ry))
+        # IK + label run once per frame for the newest sample only;
+        # the path above keeps every sample
+        self._pending_motion = (rx, ry)
+        if self._motion_job is None:
+            self._motion_job = self.root.after(READOUT_MS, self._flush_motion)
+        self.last_x, self.last_y = event.x, event.y
+
+    def _flush_motion(self):
+        self._motion_job = None
+        rx, ry = self._pending_motion
+        # Readout resolution is 0.01", so re-visited spots hit the cache
+        angles = _ik_cached(round(rx * 100), round(ry * 100))
+        if angles is not None:
+            t1, t2 = angles
             self.pos_label.config(
                 text=f"Position: X={rx:.2f}\" Y={ry:.2f}\" | "
                      f"θ1={t1:.1f}° θ2={t2:.1f}°")
-        except ValueError:
-            pass
-        self.last_x, self.last_y = event.x, event.y
 
     def _end_draw(self, event):
         self.last_x = self.last_y = None
+        self._stroke_id = None
         if self.drawing_path:
-            self.log_canvas(f"Captured {len(self.drawing_path)} points")
+            self.log_canvas(f"Captured {len(self.drawing_path) // 2} points")
 
     def _clear_canvas(self):
-        self.canvas.delete("all")
-        self.drawing_path = []
-        self._draw_workspace()
+        # Only user strokes go; the workspace guide items are kept as-is
+        self.canvas.delete("stroke")
+        self.drawing_path = array("d")
         self.log_canvas("Canvas cleared")
 
     def _export_canvas(self):
@@ -362,30 +490,30 @@ class RobotControllerGUI:
         if not self.drawing_path:
             messagebox.showwarning("No Drawing", "Draw something on the canvas first!")
             return
-        x0, y0 = self.drawing_path[0]
-        lines = [
-            "G90",
-            "G20",
-            "G28",
-            f"G0 X{x0:.3f} Y{y0:.3f}",
-        ]
-        for x, y in self.drawing_path[1:]:
-            lines.append(f"G1 X{x:.3f} Y{y:.3f} F{DEFAULT_FEED_RATE}")
-        lines += ["G28", "M2"]
-        self._write_moves_txt("\n".join(lines))
+        path = simplify_path(self.drawing_path)
+        self.log_canvas(f"Simplified {len(self.drawing_path) // 2} → "
+                        f"{len(path) // 2} points")
+        x0, y0 = path[0], path[1]
+        rest = islice(path, 2, None)   # zip(rest, rest) pairs x, y
+        header = f"G90\nG20\nG28\nG0 X{x0:.3f} Y{y0:.3f}\n"
+        # Single join over a generator: no intermediate list of lines
+        body = "".join(_G1_FMT % xy for xy in zip(rest, rest))
+        self._write_moves_txt(header + body + "G28\nM2")
 
     # ------------------------------------------------------------------
     # G-CODE TAB
     # ------------------------------------------------------------------
 
-    def _sync_preview(self, _event=None):
-        """Keep right-hand preview in sync with the editor."""
+    def _on_gcode_modified(self, _event=None):
+        """The preview peer follows on its own; just drop the snapshot."""
         self.gcode_text.edit_modified(False)
-        content = self.gcode_text.get(1.0, tk.END)
-        self.preview.config(state=tk.NORMAL)
-        self.preview.delete(1.0, tk.END)
-        self.preview.insert(1.0, content)
-        self.preview.config(state=tk.DISABLED)
+        self._gcode_cache = None
+
+    def _current_gcode(self):
+        """Editor text; copied from the widget at most once per edit."""
+        if self._gcode_cache is None:
+            self._gcode_cache = self.gcode_text.get(1.0, tk.END)
+        return self._gcode_cache
 
     def _load_file(self):
         path = filedialog.askopenfilename(
@@ -396,14 +524,17 @@ class RobotControllerGUI:
             try:
                 with open(path, "r") as f:
                     self.gcode_text.delete(1.0, tk.END)
-                    self.gcode_text.insert(1.0, f.read())
+                    # 64 KB at a time so big files don't freeze the window
+                    for chunk in iter(lambda: f.read(65536), ""):
+                        self.gcode_text.insert(tk.END, chunk)
+                        self.root.update_idletasks()
                 self.log_gcode(f"Loaded: {path}")
             except Exception as e:
                 messagebox.showerror("Load Error", str(e))
 
     def _save_gcode(self):
         """Save raw G-code text directly to moves.txt — no conversion."""
-        text = self.gcode_text.get(1.0, tk.END).strip()
+        text = self._current_gcode().strip()
         if not text:
             messagebox.showwarning("Empty", "Nothing to save.")
             return
@@ -426,9 +557,12 @@ class RobotControllerGUI:
         if not path:
             return
         try:
-            with open(path, "w") as f:
-                f.write(gcode_text)
-            n = len([l for l in gcode_text.splitlines() if l.strip()])
+            data = gcode_text.encode("ascii", "ignore")
+            if not data.endswith(b"\n"):
+                data += b"\n"   # terminate the last line for the Arduino
+            with open(path, "wb", buffering=1 << 20) as f:
+                f.write(data)
+            n = sum(1 for l in gcode_text.splitlines() if l.strip())
             self.log_gcode(f"Saved {n} lines → {path}")
             messagebox.showinfo(
                 "Saved",
@@ -443,12 +577,25 @@ class RobotControllerGUI:
     # ------------------------------------------------------------------
 
     def log_canvas(self, msg):
-        self.canvas_log.insert(tk.END, msg + "\n")
-        self.canvas_log.see(tk.END)
+        self._queue_log("canvas_log", msg)
 
     def log_gcode(self, msg):
-        self.gcode_log.insert(tk.END, msg + "\n")
-        self.gcode_log.see(tk.END)
+        self._queue_log("gcode_log", msg)
+
+    def _queue_log(self, widget_name, msg):
+        """Buffer a log line; bursts are written in one insert per widget."""
+        self._log_pending[widget_name].append(msg)
+        if self._log_flush_job is None:
+            self._log_flush_job = self.root.after(50, self._flush_logs)
+
+    def _flush_logs(self):
+        self._log_flush_job = None
+        for widget_name, msgs in self._log_pending.items():
+            widget = getattr(self, widget_name, None)   # None until tab built
+            if msgs and widget is not None:
+                widget.insert(tk.END, "\n".join(msgs) + "\n")
+                widget.see(tk.END)
+                msgs.clear()
 
 # ============================================================================
 # ENTRY POINT
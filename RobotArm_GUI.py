@@ -1,57 +1,178 @@
 #i am a pusgfigiggijrigj
 
+import math
+import queue
+import re
+import threading
+from collections import deque, namedtuple
+from functools import lru_cache
+
+# Compiled once: leading G/M word, then letter/number parameter pairs
+_CMD_RE = re.compile(r'([GM])0*(\d+)')
+_TOK_RE = re.compile(r'([A-Z])([-+]?(?:\d+\.?\d*|\.\d+))')
+
+_DEG_PER_RAD = 180.0 / math.pi  # multiply instead of calling math.degrees
+
+# Arm position in inches; rapid marks the target of a G0 move
+Pt = namedtuple('Pt', ('x', 'y', 'rapid'), defaults=(False,))
+
+@lru_cache(maxsize=4096)
+def _parse_tokens(line):
+    """
+    Pure tokenizer behind GCodeParser.parse_line, memoized per raw line
+    Returns (command, ((letter, value), ...)) so cached results stay immutable
+    """
+    # Remove comments and whitespace
+    line = line.partition(';')[0].strip().upper()
+
+    # Extract command and parameters in a single regex scan each
+    match = _CMD_RE.match(line)
+    if match:
+        command = match.group(1) + match.group(2)
+        line = line[match.end():]
+    else:
+        command = None
+    params = tuple((k, float(v)) for k, v in _TOK_RE.findall(line))
+
+    return command, params
+
 class GCodeParser:
     def __init__(self):
         self.absolute_mode = True  # G90 vs G91
         self.units = 'inches'      # G20 vs G21
-        self.current_pos = {'x': 0, 'y': 0}
+        self.cx = 0.0              # current position, inches
+        self.cy = 0.0
         self.feed_rate = 4.0       # inches/sec
     
     def parse_line(self, line):
-        # Remove comments and whitespace
-        line = line.split(';')[0].strip()
-        
-        # Extract command and parameters
-        command = self.extract_command(line)
-        params = self.extract_parameters(line)
-        
-        return {'command': command, 'params': params}
+        command, params = _parse_tokens(line)
+        return {'command': command, 'params': dict(params)}
+    
+    def parse_program(self, text):
+        """
+        Parse a whole program up front, skipping blank and comment-only lines
+        Returns the parse_line result of every remaining line, in order
+        """
+        return [self.parse_line(line) for line in text.splitlines()
+                if line.partition(';')[0].strip()]
     
     def execute_command(self, cmd_dict):
-        command = cmd_dict['command']
-        params = cmd_dict['params']
-        
-        if command == 'G0':
-            return self.rapid_move(params)
-        elif command == 'G1':
-            return self.linear_move(params)
-        elif command == 'G90':
-            self.absolute_mode = True
-        elif command == 'G91':
-            self.absolute_mode = False
+        handler = self._DISPATCH.get(cmd_dict['command'])
+        if handler:
+            return handler(self, cmd_dict['params'])
         # ... handle other commands
 
+    def parse_stream(self, fp, chunksize=65536):
+        """
+        Execute G-code read from a binary file object in large chunks
+        Yields the target position of every movement command
+        """
+        buf = b''
+        while True:
+            chunk = fp.read(chunksize)
+            if not chunk:
+                break
+            lines = (buf + chunk).split(b'\n')
+            buf = lines.pop()
+            for raw in lines:
+                result = self.execute_command(
+                    self.parse_line(raw.decode('ascii', 'ignore')))
+                if result:
+                    yield result
+        if buf:
+            result = self.execute_command(
+                self.parse_line(buf.decode('ascii', 'ignore')))
+            if result:
+                yield result
+
+    def rapid_move(self, params):
+        return self._move_to(params, rapid=True)
+
+    def linear_move(self, params):
+        if 'F' in params:
+            # F is in the current units per second, like X and Y
+            self.feed_rate = params['F'] / self._UNIT_SCALE[self.units]
+        return self._move_to(params)
+
+    def _move_to(self, params, rapid=False):
+        scale = self._UNIT_SCALE[self.units]
+        x, y = self.cx, self.cy
+        if self.absolute_mode:
+            x = params['X'] / scale if 'X' in params else x
+            y = params['Y'] / scale if 'Y' in params else y
+        else:
+            x += params.get('X', 0.0) / scale
+            y += params.get('Y', 0.0) / scale
+        if x == self.cx and y == self.cy:
+            return None  # e.g. feed-only "G1 F2": nothing to move
+        self.cx, self.cy = x, y
+        return Pt(x, y, rapid)
+
+    # Divide program values by this to get inches
+    _UNIT_SCALE = {'inches': 1.0, 'mm': 25.4}
+
+    def _set_absolute(self, params):
+        self.absolute_mode = True
+
+    def _set_incremental(self, params):
+        self.absolute_mode = False
+
+    def _set_inches(self, params):
+        self.units = 'inches'
+
+    def _set_millimeters(self, params):
+        self.units = 'mm'
+
+    # Opcode -> handler, built once at class definition
+    _DISPATCH = {
+        'G0': rapid_move,
+        'G1': linear_move,
+        'G20': _set_inches,
+        'G21': _set_millimeters,
+        'G90': _set_absolute,
+        'G91': _set_incremental,
+    }
+
 class SCARAKinematics:
     def __init__(self, L1, L2):
         self.L1 = L1  # Length of first arm segment
         self.L2 = L2  # Length of second arm segment
+        self.max_reach_sq = (L1 + L2)**2  # reach limits, squared
+        self.min_reach_sq = (L1 - L2)**2
+        # Equal links simplify the law of cosines: cos(t2) = r2/(2*L1^2) - 1
+        self._equal_links = (L1 == L2)
+        self._two_l1sq = 2 * L1 * L1
+        # General case: cos(t2) = (r2 - (L1^2 + L2^2)) * 1/(2*L1*L2)
+        self._l_sq_sum = L1 * L1 + L2 * L2
+        self._inv_2l1l2 = 1.0 / (2 * L1 * L2)
     
     def inverse_kinematics(self, x, y):
         """
         Convert Cartesian (x,y) to joint angles (theta1, theta2)
         Returns angles in degrees
         """
-        import math
-        
-        # Distance from origin to target
-        r = math.sqrt(x**2 + y**2)
+        theta1, theta2, ok = self.try_inverse_kinematics(x, y)
+        if not ok:
+            raise ValueError("Position out of reach")
+        return theta1, theta2
+
+    def try_inverse_kinematics(self, x, y):
+        """
+        Non-raising inverse_kinematics for batch/streaming callers
+        Returns (theta1, theta2, ok); (nan, nan, False) when out of reach
+        """
+        # Squared distance from origin to target (no sqrt needed)
+        r2 = x * x + y * y
         
         # Check if position is reachable
-        if r > (self.L1 + self.L2) or r < abs(self.L1 - self.L2):
-            raise ValueError("Position out of reach")
+        if r2 > self.max_reach_sq or r2 < self.min_reach_sq:
+            return math.nan, math.nan, False
         
         # Law of cosines for theta2
-        cos_theta2 = (x**2 + y**2 - self.L1**2 - self.L2**2) / (2 * self.L1 * self.L2)
+        if self._equal_links:
+            cos_theta2 = r2 / self._two_l1sq - 1.0
+        else:
+            cos_theta2 = (r2 - self._l_sq_sum) * self._inv_2l1l2
         theta2 = math.acos(cos_theta2)
         
         # Calculate theta1
@@ -59,15 +180,40 @@ class SCARAKinematics:
         k2 = self.L2 * math.sin(theta2)
         theta1 = math.atan2(y, x) - math.atan2(k2, k1)
         
-        return math.degrees(theta1), math.degrees(theta2)
-    
+        return theta1 * _DEG_PER_RAD, theta2 * _DEG_PER_RAD, True
+
+    def inverse_kinematics_batch(self, xs, ys):
+        """
+        Vectorized inverse_kinematics over arrays of x and y
+        Returns (theta1, theta2, reachable) with angles in degrees;
+        out-of-reach points are flagged in the mask instead of raising
+        """
+        xs = np.asarray(xs, dtype=np.float64)
+        ys = np.asarray(ys, dtype=np.float64)
+        r2 = xs * xs + ys * ys
+
+        reachable = (r2 <= self.max_reach_sq) & (r2 >= self.min_reach_sq)
+
+        if self._equal_links:
+            cos_theta2 = r2 / self._two_l1sq - 1.0
+        else:
+            cos_theta2 = (r2 - self._l_sq_sum) * self._inv_2l1l2
+        theta2 = np.arccos(np.clip(cos_theta2, -1.0, 1.0))
+
+        k1 = self.L1 + self.L2 * np.cos(theta2)
+        k2 = self.L2 * np.sin(theta2)
+        theta1 = np.arctan2(ys, xs) - np.arctan2(k2, k1)
+
+        return theta1 * _DEG_PER_RAD, theta2 * _DEG_PER_RAD, reachable
+
 import numpy as np
 
 class MotionController:
     def __init__(self, kinematics):
         self.kinematics = kinematics
         self.max_speed = 4.0  # inches/sec
-        self.emergency_stop = False
+        self.send_window = 0.5  # sec of motion per motor batch (stop < 1 s)
+        self.stop_event = threading.Event()  # set once by emergency stop
     
     def generate_trajectory(self, start, end, speed):
         """
@@ -75,24 +221,35 @@ class MotionController:
         to achieve desired speed while meeting accuracy requirements
         """        
         # Calculate distance and time
-        distance = np.sqrt((end['x']-start['x'])**2 + (end['y']-start['y'])**2)
+        distance = np.hypot(end.x - start.x, end.y - start.y)
         time_required = distance / speed
         
         # Generate waypoints (more points = better accuracy)
         num_points = max(10, int(distance * 10))  # 10 points per inch
-        waypoints = []
-        
-        for i in range(num_points + 1):
-            t = i / num_points
-            x = start['x'] + t * (end['x'] - start['x'])
-            y = start['y'] + t * (end['y'] - start['y'])
-            waypoints.append({'x': x, 'y': y})
-        
-        return waypoints, time_required
+
+        # One vectorized pass instead of a Python loop; separate x and y
+        # arrays (SoA) feed the batch IK directly.
+        # float32 is ample for inch coordinates; IK upcasts to float64.
+        t = np.linspace(0.0, 1.0, num_points + 1)
+        xs = (start.x + t * (end.x - start.x)).astype(np.float32)
+        ys = (start.y + t * (end.y - start.y)).astype(np.float32)
+
+        return xs, ys, time_required
+    
+    def joint_rates(self, theta1, theta2, time_required):
+        """
+        Angular speed (deg/sec) each waypoint-to-waypoint step needs so the
+        whole move takes time_required; the joint with the larger change sets it
+        """
+        steps = len(theta1) - 1
+        if steps < 1 or time_required <= 0:
+            return np.zeros(max(steps, 0))
+        dt = time_required / steps
+        return np.maximum(np.abs(np.diff(theta1)), np.abs(np.diff(theta2))) / dt
     
     def emergency_stop_handler(self):
         """Stop all motion within 1 second"""
-        self.emergency_stop = True
+        self.stop_event.set()  # wakes a waiting worker immediately
         # Implement deceleration profile here
 
     
@@ -108,6 +265,16 @@ class RoboticArmGUI:
         self.parser = GCodeParser()
         self.kinematics = SCARAKinematics(L1=10, L2=10)  # Adjust lengths
         self.controller = MotionController(self.kinematics)
+        # Home pose: shoulder at 0 deg, elbow at 90 deg. The origin is the
+        # IK singularity (theta1 undefined), so never start a move from it.
+        # The parser starts there too, so G-code coordinates match the arm.
+        self.current_position = Pt(float(self.kinematics.L1),
+                                   float(self.kinematics.L2))
+        self.parser.cx, self.parser.cy = self.current_position[:2]
+        self._worker = None            # thread running the current program
+        self._latest_pos = None        # newest position reached by the worker
+        self._status_msgs = deque()    # worker -> GUI status lines
+        self._program_cache = None     # parsed editor text; None after edits
         
         self.setup_ui()
     
@@ -116,6 +283,7 @@ class RoboticArmGUI:
         tk.Label(self.root, text="G-code Commands:").pack()
         self.gcode_text = scrolledtext.ScrolledText(self.root, height=10)
         self.gcode_text.pack(padx=10, pady=5)
+        self.gcode_text.bind("<<Modified>>", self._on_gcode_modified)
         
         # Control buttons
         button_frame = tk.Frame(self.root)
@@ -135,8 +303,9 @@ class RoboticArmGUI:
         self.status_text.pack(padx=10, pady=5)
         
         # Position display
+        home = self.current_position
         self.position_label = tk.Label(self.root, 
-                                      text="Current Position: X=0.00 Y=0.00")
+                                      text=f"Current Position: X={home.x:.2f} Y={home.y:.2f}")
         self.position_label.pack()
     
     def load_file(self):
@@ -146,53 +315,207 @@ class RoboticArmGUI:
         if filename:
             with open(filename, 'r') as f:
                 self.gcode_text.delete(1.0, tk.END)
-                self.gcode_text.insert(1.0, f.read())
+                # 1 MB at a time: never a second full-size copy in memory
+                for chunk in iter(lambda: f.read(1 << 20), ''):
+                    self.gcode_text.insert(tk.END, chunk)
     
     def execute_gcode(self):
-        gcode_lines = self.gcode_text.get(1.0, tk.END).split('\n')
-        
-        for line in gcode_lines:
-            if self.controller.emergency_stop:
-                self.status_text.insert(tk.END, "STOPPED BY EMERGENCY\n")
+        if self._worker is not None and self._worker.is_alive():
+            return  # a program is already running
+        # Parse everything first, and only again after the text is edited;
+        # the worker thread only executes
+        if self._program_cache is None:
+            self._program_cache = self.parser.parse_program(
+                self.gcode_text.get(1.0, tk.END))
+        program = self._program_cache
+        self._worker = threading.Thread(target=self._run_program,
+                                        args=(program,), daemon=True)
+        self._worker.start()
+        self.root.after(33, self._flush_status)
+    
+    def _on_gcode_modified(self, event=None):
+        self.gcode_text.edit_modified(False)
+        self._program_cache = None
+    
+    def _run_program(self, program):
+        # Runs on the worker thread: no Tk calls, results are handed over
+        # through _latest_pos and _status_msgs for _flush_status to show.
+        # Moves are planned here (trajectory + IK) while a second thread
+        # sends the previous ones; the bounded queue keeps planning at most
+        # a few moves ahead of the motors.
+        moves = queue.Queue(maxsize=8)
+        send_failed = threading.Event()
+        sender = threading.Thread(target=self._send_moves,
+                                  args=(moves, send_failed), daemon=True)
+        sender.start()
+        start = self.current_position
+        for parsed in program:
+            if self.controller.stop_event.is_set():
+                self._status_msgs.append("STOPPED BY EMERGENCY")
                 break
+            if send_failed.is_set():
+                break  # the sender already reported why
             
-            if line.strip():
-                try:
-                    parsed = self.parser.parse_line(line)
-                    result = self.parser.execute_command(parsed)
+            try:
+                result = self.parser.execute_command(parsed)
+                
+                if result:  # Movement command
+                    moves.put(self.plan_move(start, result))
+                    start = result
                     
-                    if result:  # Movement command
-                        self.move_to_position(result)
-                        
-                except Exception as e:
-                    self.status_text.insert(tk.END, f"Error: {str(e)}\n")
-    
-    def move_to_position(self, position):
-        # Convert to joint angles
-        theta1, theta2 = self.kinematics.inverse_kinematics(
-            position['x'], position['y']
+            except Exception as e:
+                self._status_msgs.append(f"Error: {str(e)}")
+        moves.put(None)  # end of program
+        sender.join()
+    
+    def _send_moves(self, moves, send_failed):
+        # Consumer side of _run_program; after a stop or a send error it
+        # keeps draining the queue up to the None sentinel without sending,
+        # so the planner can never block on put() and join() always returns
+        while True:
+            plan = moves.get()
+            if plan is None:
+                break
+            if self.controller.stop_event.is_set() or send_failed.is_set():
+                continue
+            try:
+                self.send_move(plan)
+            except Exception as e:
+                self._status_msgs.append(f"Error: {str(e)}")
+                send_failed.set()
+    
+    def _flush_status(self):
+        """
+        Show the worker's latest position and queued messages, ~30 times/sec
+        Reschedules itself until the program thread has finished
+        """
+        running = self._worker.is_alive()  # checked first: no lost messages
+        position = self._latest_pos
+        if position is not None:
+            self.position_label.config(
+                text=f"Current Position: X={position.x:.2f} Y={position.y:.2f}"
+            )
+        if self._status_msgs:
+            lines = []
+            while self._status_msgs:
+                lines.append(self._status_msgs.popleft() + "\n")
+            self.status_text.insert(tk.END, "".join(lines))
+        if running:
+            self.root.after(33, self._flush_status)
+    
+    def plan_move(self, start, position):
+        """
+        Trajectory, joint angles and joint rates for one move from start
+        Raises ValueError if any waypoint is out of reach
+        """
+        # Waypoints stay as x and y arrays from trajectory through IK
+        if position.rapid:
+            # Rapids only need their endpoints, not an interpolated path
+            xs = np.array([start.x, position.x], dtype=np.float32)
+            ys = np.array([start.y, position.y], dtype=np.float32)
+            time_required = math.hypot(
+                position.x - start.x,
+                position.y - start.y
+            ) / self.controller.max_speed
+        else:
+            xs, ys, time_required = self.controller.generate_trajectory(
+                start, position, self.parser.feed_rate
+            )
+        
+        # Convert the whole move to joint angles in one batch
+        theta1, theta2, reachable = self.kinematics.inverse_kinematics_batch(
+            xs, ys
         )
+        if not reachable.all():
+            raise ValueError("Position out of reach")
         
-        # Send to motors (you'll implement this based on your hardware)
-        self.send_to_motors(theta1, theta2)
+        # theta1 comes from atan2 and wraps at +-180 deg: unwrap it within
+        # the move so a path across the negative x axis stays continuous,
+        # with the move's start brought back into [-180, 180)
+        theta1 = np.unwrap(theta1, period=360.0)
+        theta1 -= 360.0 * math.floor((theta1[0] + 180.0) / 360.0)
         
-        # Update display
-        self.position_label.config(
-            text=f"Current Position: X={position['x']:.2f} Y={position['y']:.2f}"
-        )
-        self.root.update()
+        # Joint speeds for every step, computed once for the whole move
+        rates = self.controller.joint_rates(theta1, theta2, time_required)
+        
+        # Motor commands as (N, 2) int16 tenths of a degree, quantized once;
+        # the first waypoint is where the arm already is
+        angles = np.rint(np.column_stack((theta1[1:], theta2[1:])) * 10.0)
+        if np.abs(angles).max(initial=0.0) > 32767:
+            raise ValueError("Joint angle outside motor command range")
+        angles = angles.astype(np.int16)
+        return xs, ys, angles, rates, time_required, position
+    
+    def send_move(self, plan):
+        xs, ys, angles, rates, time_required, position = plan
+        
+        # The move goes out in batches of at most send_window seconds; the
+        # motor side paces the steps within a batch from rates, and we wait
+        # for each batch before sending the next. On an emergency stop the
+        # wait returns early and the motors are told to abort.
+        steps = len(rates)
+        dt = time_required / steps if steps else 0.0
+        if dt:
+            chunk = max(1, int(self.controller.send_window / dt))
+        else:
+            chunk = max(steps, 1)
+        stop = self.controller.stop_event
+        for lo in range(0, steps, chunk):
+            hi = min(lo + chunk, steps)
+            self.send_batch(angles[lo:hi], rates[lo:hi])
+            if stop.wait((hi - lo) * dt):
+                self.stop_motors()
+                # Report only the end of the last batch that ran to
+                # completion, not a guess inside the aborted one
+                position = self.current_position
+                break
+            if hi < steps:
+                self.current_position = Pt(float(xs[hi]), float(ys[hi]))
+        self.current_position = position
+        
+        # Display is refreshed from the GUI thread by _flush_status
+        self._latest_pos = position
     
     def emergency_stop(self):
         self.controller.emergency_stop_handler()
         self.status_text.insert(tk.END, "EMERGENCY STOP ACTIVATED\n")
     
-    def send_to_motors(self, theta1, theta2):
-        # Interface with your motor controllers here
+    def send_batch(self, angles, rates):
+        # Interface with your motor controllers here, once per move
         # This could be serial communication, GPIO, etc.
+        # angles is an (N, 2) int16 array of (theta1, theta2) in tenths of
+        # a degree, so angles.tobytes() is ready to write in one go;
+        # rates[i] is the deg/sec the faster-moving joint needs for step i
+        pass
+    
+    def stop_motors(self):
+        # Abort whatever batch the motor controllers are still executing
+        # Called from the sender thread when an emergency stop interrupts
+        # a move; should return once the joints have stopped
         pass
 
+def parse_file(path, progress_every=1000):
+    """
+    Headless dry run of a G-code file: parse/execute every line without the GUI
+    Prints progress only every progress_every moves, then a one-line summary
+    """
+    parser = GCodeParser()
+    moves = 0
+    with open(path, 'rb') as f:
+        for _ in parser.parse_stream(f):
+            moves += 1
+            if progress_every and moves % progress_every == 0:
+                print(f"{moves} moves...")
+    print(f"{path}: {moves} moves, final position "
+          f"X={parser.cx:.2f} Y={parser.cy:.2f}")
+    return moves
+
 # Run the application
 if __name__ == "__main__":
-    root = tk.Tk()
-    app = RoboticArmGUI(root)
-    root.mainloop()
\ No newline at end of file
+    import sys
+    if len(sys.argv) > 1:
+        parse_file(sys.argv[1])
+    else:
+        root = tk.Tk()
+        app = RoboticArmGUI(root)
+        root.mainloop()
\ No newline at end of file
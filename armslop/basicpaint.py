@@ -3,6 +3,9 @@ import math
 
 BRUSH_SIZE = 5
 COLOR = "black"
+MIN_STEP = 3  # px; drags shorter than this since the last point are skipped
+INV_800 = 1.0 / 800  # compute_angles divides the radius by 800
+RAD2DEG = 180.0 / math.pi
 
 root = tk.Tk()
 root.title("Tiny Paint")
@@ -13,34 +16,41 @@ canvas.pack()
 
 cartisian_x, last_y = None, None
 cartisian_y = None
+stroke_id = None  # one polyline item per stroke
+stroke_pts = []   # its flat [x0, y0, x1, y1, ...] coords
 
 def compute_angles() :
     if cartisian_x is None or cartisian_y is None:
         return
 
-    r = math.sqrt(cartisian_x**2 + cartisian_y**2)
+    r_over_c = math.hypot(cartisian_x, cartisian_y) * INV_800
     theta = math.atan2(cartisian_y, cartisian_x)
 
-    angle1 = math.acos(r / 800) + theta
-    angle2 = (math.pi/2 - (angle1 - theta)) * 2
-
-    angle1= math.degrees(angle1)
-    angle1=round(angle1)
-
-    angle2 = math.degrees(angle2)
-    angle2 = round(angle2)
+    a = math.acos(r_over_c)
+    angle1 = round((a + theta) * RAD2DEG)
+    angle2 = round((math.pi - 2 * a) * RAD2DEG)
     print(angle1,',',angle2,sep='')
 
 def start_draw(event):
-    global cartisian_x, last_y
+    global cartisian_x, last_y, stroke_id, stroke_pts
     cartisian_x, last_y = event.x, event.y
+    stroke_id, stroke_pts = None, [event.x, event.y]
 
 def draw(event):
-    global cartisian_x, last_y, cartisian_y
-    canvas.create_line(
-        cartisian_x, last_y, event.x, event.y,
-        width=BRUSH_SIZE, fill=COLOR, capstyle=tk.ROUND
-    )
+    global cartisian_x, last_y, cartisian_y, stroke_id
+    # tiny moves round to the same angles, so wait until the mouse has
+    # really moved; the next line still starts at the last drawn point
+    if abs(event.x - cartisian_x) + abs(event.y - last_y) < MIN_STEP:
+        return
+    # extend the stroke's single line item instead of adding one per segment
+    stroke_pts.extend((event.x, event.y))
+    if stroke_id is None:
+        stroke_id = canvas.create_line(
+            *stroke_pts,
+            width=BRUSH_SIZE, fill=COLOR, capstyle=tk.ROUND, joinstyle=tk.ROUND
+        )
+    else:
+        canvas.coords(stroke_id, *stroke_pts)
     cartisian_x, last_y = event.x, event.y
     cartisian_y = 733-last_y
     cartisian_x = int(cartisian_x)